@@ -10,12 +10,22 @@ canonicalisation (alias expansion + cleanup) to collapse spelling variants.
 """
 
 import argparse
+import functools
+import multiprocessing
 import re
 import sys
 from collections import Counter
 from pathlib import Path
 from typing import Dict, Iterator, List, Tuple
 
+from canonicalizer import (
+    RE_PAREN_BAL as _RE_PAREN_BAL,
+    RE_PAREN_UNBAL as _RE_PAREN_UNBAL,
+    RE_TRAIL_CITY as _RE_TRAIL_CITY,
+    RE_WS as _RE_WS,
+    partition_aliases,
+)
+
 
 # Expand this alias map as you notice more spellings.
 ALIASES: Dict[str, str] = {
@@ -53,87 +63,234 @@ ALIASES: Dict[str, str] = {
 
 MISSING_PAT = re.compile(r"(not\s*(found|available)|^n/?a$|unknown)", re.I)
 
-
+# Bare word-boundary literals (MIT, CMU, EPFL, …) dispatch through a dict
+# lookup on the uppercased token; only the residual true-regex rules
+# (anchored or whitespace-tolerant) still need a compiled-pattern search.
+_LITERAL_ALIAS, _REGEX_ALIAS_RULES = partition_aliases(ALIASES)
+_TOKEN_RE = re.compile(r"[A-Za-z]+")
+# one alternation over the residual patterns, used only to answer "could any
+# residual rule fire?" on the fast path below
+_RESIDUAL_ALIAS_ANY = re.compile(
+    "|".join(f"(?:{pat.pattern})" for _, pat, _ in _REGEX_ALIAS_RULES), re.IGNORECASE
+)
+# characters/phrases that trigger the cleanup pipeline: parens, separators,
+# leading "The", unicode dashes, commas (trailing-city trim), and abnormal
+# whitespace — runs or anything that isn't a plain space — which the
+# whitespace-collapse step would rewrite
+_NEEDS_WORK = re.compile(r"[();&,–—]|^the\s|\sand\s|\s\s|[^\S ]", re.I)
+_RE_LEADING_THE = re.compile(r"^The\s+", re.I)
+_RE_AND_INST = re.compile(r"\s+and\s+(?=(University|College|Institut|School|Polytechnic))")
+
+
+@functools.lru_cache(maxsize=65536)
 def canonicalise_school(inst: str) -> str:
+    # Raw school strings repeat heavily, so each distinct string pays the
+    # regex pipeline once; duplicates are a dict hit.
     inst = inst.strip()
     if not inst or MISSING_PAT.search(inst):
         return ""
 
+    # fast path: nothing for the pipeline to do and no alias can fire —
+    # return as-is after two searches and a token scan
+    if (
+        not _NEEDS_WORK.search(inst)
+        and not _RESIDUAL_ALIAS_ANY.search(inst)
+        and not any(tok.upper() in _LITERAL_ALIAS for tok in _TOKEN_RE.findall(inst))
+    ):
+        return inst
+
     inst = inst.replace("–", "-").replace("—", "-")
-    inst = re.sub(r"^The\s+", "", inst, flags=re.I)
+    inst = _RE_LEADING_THE.sub("", inst)
     inst = inst.split(";")[0].strip()  # keep first institution if semicolon-separated
 
-    # expand common abbreviations
-    for pat, repl in ALIASES.items():
-        if re.search(pat, inst, flags=re.I):
-            inst = re.sub(pat, repl, inst, flags=re.I)
+    # expand common abbreviations: literal tokens via dict lookup, regex
+    # rules via subn, keeping the alias map's first-match-wins order
+    # across the two tiers
+    lit = None  # (rank, start, end, repl) of the winning literal hit
+    for m in _TOKEN_RE.finditer(inst):
+        hit = _LITERAL_ALIAS.get(m.group().upper())
+        if hit is None:
+            continue
+        start, end = m.span()
+        # tokens are maximal letter runs, so only an abutting digit,
+        # underscore or non-ASCII letter can break the original \b
+        if (start and (inst[start - 1].isalnum() or inst[start - 1] == "_")) or (
+            end < len(inst) and (inst[end].isalnum() or inst[end] == "_")
+        ):
+            continue
+        if lit is None or hit[0] < lit[0]:
+            lit = (hit[0], start, end, hit[1])
+    expanded = False
+    for rank, pat, repl in _REGEX_ALIAS_RULES:
+        if lit is not None and rank > lit[0]:
+            break  # the literal hit comes first in the alias map
+        # subn reports whether the rule fired, so one call replaces the
+        # search-then-sub pair; count=1 stops after the first match
+        inst, n = pat.subn(repl, inst, count=1)
+        if n:
+            expanded = True
             break
+    if not expanded and lit is not None:
+        _, start, end, repl = lit
+        # splice by span: only the boundary-checked occurrence is replaced
+        inst = inst[:start] + repl + inst[end:]
 
     # keep only the first institution in “X & Y” or “X and Y” (when Y looks like an institution)
     inst = inst.split("&")[0].strip()
-    inst = re.split(r"\s+and\s+(?=(University|College|Institut|School|Polytechnic))", inst, maxsplit=1)[0].strip()
+    inst = _RE_AND_INST.split(inst, maxsplit=1)[0].strip()
 
     # remove balanced (…) and dangling “( …”
-    inst = re.sub(r"\([^)]*\)", " ", inst)  # balanced
-    inst = re.sub(r"\s*\(.*$", "", inst)  # unmatched
-    inst = re.sub(r"\s+", " ", inst).strip()
+    inst = _RE_PAREN_BAL.sub(" ", inst)  # balanced
+    inst = _RE_PAREN_UNBAL.sub("", inst)  # unmatched
+    inst = _RE_WS.sub(" ", inst).strip()
 
-    # trim trailing “, Country / City / Campus” except UC & U‑Maryland
-    if not inst.startswith(("University of California,", "University of Maryland,")):
-        inst = re.sub(r",\s*[A-Z][A-Za-z.\s]+$", "", inst).strip()
+    # trim trailing “, Country / City / Campus” except UC & U‑Maryland;
+    # the '","' precheck keeps the regex engine out of the comma-free majority
+    if "," in inst and not inst.startswith(
+        ("University of California,", "University of Maryland,")
+    ):
+        inst = _RE_TRAIL_CITY.sub("", inst).strip()
 
     return inst
 
 
 def parse_processed_lines(path: Path) -> Iterator[Tuple[str, str]]:
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if "|" not in line:
+    # bytes.splitlines scans for newlines in C and skips the text decoder's
+    # per-character state machine; only the two kept fields get decoded
+    for raw in path.read_bytes().splitlines():
+        # partition scans once; sep is empty exactly when '|' was absent
+        name, sep, school = raw.partition(b"|")
+        if not sep:
             continue
-        name, school = [part.strip() for part in line.split("|", 1)]
+        # strip after decoding: bytes.strip only knows ASCII whitespace,
+        # so e.g. a trailing NBSP would survive and defeat the dedupe
+        school = school.decode("utf-8").strip()
         if school:
-            yield name, school
+            # interned names make the dedupe set/dict hashing cheaper
+            yield sys.intern(name.decode("utf-8").strip()), school
 
 
-def tally_schools(
-    input_path: Path,
-) -> Tuple[Counter, int, int, List[Tuple[str, str, str]]]:
-    """Return counts plus dedupe stats.
+def _tally_rows(
+    rows: List[Tuple[int, str, str]],
+) -> Tuple[Counter, Dict[str, int], int, int, List[Tuple[int, str, str, str]]]:
+    """Tally one batch of (row_idx, name, school) rows.
 
-    - skip exact duplicate names (counts same person once)
-    - record conflicts where the same name is paired with different schools
-    - track missing/unknown school lines
+    Runs serially or in a worker process. Row indices let the parallel
+    merge reproduce the serial ordering: first_idx records the first row
+    that counted each canonical school, and conflicts carry the row that
+    triggered them.
     """
     counter: Counter = Counter()
-    seen_names: Dict[str, str] = {}
+    first_idx: Dict[str, int] = {}
+    # (name, canon) pairs settle the common duplicate case with one set
+    # lookup; first_canon keeps the first accepted school per name, which
+    # the conflict messages need.
+    seen_pairs: set = set()
+    first_canon: Dict[str, str] = {}
     skipped_duplicates = 0
     skipped_missing = 0
-    conflicts: List[Tuple[str, str, str]] = []
+    conflicts: List[Tuple[int, str, str, str]] = []
 
-    for name, school in parse_processed_lines(input_path):
-        canon = canonicalise_school(school)
+    for idx, name, school in rows:
+        # few distinct canonical names, many rows: interning collapses the
+        # duplicates to one object, so hash lookups short-circuit on identity
+        canon = sys.intern(canonicalise_school(school))
         if not canon:
             skipped_missing += 1
             continue
 
-        if name in seen_names:
-            if seen_names[name] == canon:
-                skipped_duplicates += 1
-                continue
-            conflicts.append((name, seen_names[name], canon))
+        pair = (name, canon)
+        if pair in seen_pairs:
+            skipped_duplicates += 1
+            continue
+        if name in first_canon:
+            conflicts.append((idx, name, first_canon[name], canon))
             continue
 
-        seen_names[name] = canon
+        seen_pairs.add(pair)
+        first_canon[name] = canon
+        if canon not in first_idx:
+            first_idx[canon] = idx
         counter[canon] += 1
 
-    return counter, skipped_duplicates, skipped_missing, conflicts
+    return counter, first_idx, skipped_duplicates, skipped_missing, conflicts
+
+
+def tally_schools(
+    input_path: Path, jobs: int = 1
+) -> Tuple[Counter, int, int, List[Tuple[str, str, str]]]:
+    """Return counts plus dedupe stats.
+
+    - skip exact duplicate names (counts same person once)
+    - record conflicts where the same name is paired with different schools
+    - track missing/unknown school lines
+
+    With jobs > 1, rows are partitioned by name hash across worker
+    processes, so all rows for one name land in the same worker and the
+    results — including tie order in the counts table, which follows first
+    appearance — match the serial run exactly.
+    """
+    rows = [
+        (idx, name, school)
+        for idx, (name, school) in enumerate(parse_processed_lines(input_path))
+    ]
+    if jobs <= 1:
+        counter, _, skipped_duplicates, skipped_missing, conflicts = _tally_rows(rows)
+        return (
+            counter,
+            skipped_duplicates,
+            skipped_missing,
+            [(name, first, other) for _, name, first, other in conflicts],
+        )
+
+    buckets: List[List[Tuple[int, str, str]]] = [[] for _ in range(jobs)]
+    for row in rows:
+        buckets[hash(row[1]) % jobs].append(row)
+    with multiprocessing.Pool(jobs) as pool:
+        parts = pool.map(_tally_rows, buckets)
+
+    totals: Counter = Counter()
+    merged_first: Dict[str, int] = {}
+    skipped_duplicates = 0
+    skipped_missing = 0
+    indexed_conflicts: List[Tuple[int, str, str, str]] = []
+    for part_counter, part_first, part_dups, part_missing, part_conflicts in parts:
+        totals.update(part_counter)
+        for canon, idx in part_first.items():
+            if canon not in merged_first or idx < merged_first[canon]:
+                merged_first[canon] = idx
+        skipped_duplicates += part_dups
+        skipped_missing += part_missing
+        indexed_conflicts.extend(part_conflicts)
+
+    # rebuild the Counter in first-appearance order so most_common breaks
+    # count ties the same way the serial run does
+    counter = Counter(
+        {
+            canon: totals[canon]
+            for canon in sorted(merged_first, key=merged_first.__getitem__)
+        }
+    )
+    indexed_conflicts.sort()
+    return (
+        counter,
+        skipped_duplicates,
+        skipped_missing,
+        [(name, first, other) for _, name, first, other in indexed_conflicts],
+    )
 
 
 def save_counts(counter: Counter, output_path: Path) -> None:
-    lines = ["School | Student Count", "- | -"]
-    for school, count in counter.most_common():
-        lines.append(f"{school} | {count}")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # writelines pulls one row at a time through the file buffer, so peak
+    # memory stays at one line instead of the whole table as one string
+    with output_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write("School | Student Count\n- | -\n")
+        f.writelines(
+            # " | ".join on a tuple skips the f-string formatter's parsing
+            " | ".join((school, str(count))) + "\n"
+            for school, count in counter.most_common()
+        )
 
 
 def main() -> None:
@@ -145,13 +302,22 @@ def main() -> None:
         type=Path,
         help="Where to save the counts table (default: <input>_counts.txt)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for tallying (default: 1, serial)",
+    )
     args = parser.parse_args()
 
     output_path = args.output or args.input_file.with_name(
         f"{args.input_file.stem}_counts{args.input_file.suffix}"
     )
 
-    counts, skipped_duplicates, skipped_missing, conflicts = tally_schools(args.input_file)
+    counts, skipped_duplicates, skipped_missing, conflicts = tally_schools(
+        args.input_file, jobs=args.jobs
+    )
     save_counts(counts, output_path)
     print(f"Wrote counts for {len(counts)} schools to {output_path}")
     if skipped_duplicates:
@@ -0,0 +1,127 @@
+"""Shared machinery for canonicalising school names.
+
+The Stanford, MIT and CMU scripts each keep their own alias table and
+missing-value rules — the lists genuinely differ — but the alias dispatch
+code and the cleanup regexes were copy-pasted between them. They live here
+once: the compiled cleanup patterns, the literal/regex alias partition, and
+a factory that builds a cached alias expander (Aho-Corasick automaton for
+literal tokens when pyahocorasick is installed, one combined alternation
+for the rest).
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:  # optional: O(len(s)) literal matching regardless of alias count
+    import ahocorasick  # type: ignore
+except ImportError:  # pragma: no cover
+    ahocorasick = None
+
+# cleanup patterns shared by every canonicalisation pipeline
+RE_DASHED = re.compile(r"-+")
+RE_SPLIT_FIRST = re.compile(r"[;&]")
+RE_PAREN_BAL = re.compile(r"\([^)]*\)")
+RE_PAREN_UNBAL = re.compile(r"\s*\(.*$")
+RE_WS = re.compile(r"\s+")
+RE_TRAIL_CITY = re.compile(r",\s*[A-Z][A-Za-z.\s]+$")
+
+# matches alias keys that are a single bare \bWORD\b literal
+_LITERAL_KEY = re.compile(r"\\b([A-Za-z]+)\\b")
+
+
+def partition_aliases(
+    aliases: Dict[str, str],
+) -> Tuple[Dict[str, Tuple[int, str]], List[Tuple[int, re.Pattern, str]]]:
+    """Split an alias map into bare-literal tokens and true regex rules.
+
+    Literal keys (\\bMIT\\b, \\bCMU\\b, …) come back as a dict keyed by the
+    uppercased token; everything else is compiled case-insensitively. Both
+    carry the rule's position in the original map, so callers can keep the
+    map's first-match-wins order across the two tiers.
+    """
+    literal: Dict[str, Tuple[int, str]] = {}
+    residual: List[Tuple[int, re.Pattern, str]] = []
+    for rank, (pat, repl) in enumerate(aliases.items()):
+        m = _LITERAL_KEY.fullmatch(pat)
+        if m:
+            literal[m.group(1).upper()] = (rank, repl)
+        else:
+            residual.append((rank, re.compile(pat, re.IGNORECASE), repl))
+    return literal, residual
+
+
+def _build_alternation(
+    aliases: Dict[str, str],
+) -> Tuple[Optional[re.Pattern], Dict[str, str]]:
+    """Compile one named-group alternation over an alias map (None if empty)."""
+    if not aliases:
+        return None, {}
+    pattern = re.compile(
+        "|".join(f"(?P<a{i}>{pat})" for i, pat in enumerate(aliases)), re.I
+    )
+    return pattern, {f"a{i}": repl for i, repl in enumerate(aliases.values())}
+
+
+def make_alias_expander(aliases: Dict[str, str]) -> Callable[[str], str]:
+    """Build a cached expander that replaces every alias occurrence.
+
+    Literal tokens go through the automaton when available (falling back to
+    the combined regex otherwise); the residual rules are fused into one
+    alternation whose lastgroup picks the replacement. Institution strings
+    repeat heavily, so results are cached per unique input.
+    """
+    regex_aliases: Dict[str, str] = {}
+    automaton = None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pat, repl in aliases.items():
+            m = _LITERAL_KEY.fullmatch(pat)
+            if m:
+                tok = m.group(1).lower()
+                automaton.add_word(tok, (tok, repl))
+            else:
+                regex_aliases[pat] = repl
+        automaton.make_automaton()
+    else:
+        regex_aliases = dict(aliases)
+
+    # With an all-literal alias table the automaton handles everything and
+    # there is no alternation to build (an empty pattern would match
+    # everywhere).
+    alias_re, alias_repl = _build_alternation(regex_aliases)
+    # every alias as one regex: the escape hatch for strings whose
+    # lowercased copy changes length (see expand below)
+    if automaton is None:
+        full_re, full_repl = alias_re, alias_repl
+    else:
+        full_re, full_repl = _build_alternation(aliases)
+
+    @functools.lru_cache(maxsize=None)
+    def expand(inst: str) -> str:
+        if automaton is not None:
+            low = inst.lower()
+            if len(low) != len(inst):
+                # lower() changed the length (e.g. Turkish İ → i̇), so the
+                # automaton's offsets into low cannot be spliced into inst;
+                # run every alias through the regex fallback instead
+                if full_re is None:
+                    return inst
+                return full_re.sub(lambda m: full_repl[m.lastgroup], inst)
+            hits = []
+            for end, (tok, repl) in automaton.iter(low):
+                start = end - len(tok) + 1
+                # enforce the \b boundaries the regex version had
+                if (start == 0 or not low[start - 1].isalnum()) and (
+                    end == len(low) - 1 or not low[end + 1].isalnum()
+                ):
+                    hits.append((start, end, repl))
+            for start, end, repl in reversed(hits):
+                inst = inst[:start] + repl + inst[end + 1 :]
+        if alias_re is None:
+            return inst
+        return alias_re.sub(lambda m: alias_repl[m.lastgroup], inst)
+
+    return expand
@@ -1,8 +1,27 @@
 import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import sqlite3
+import time
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from openai import OpenAI
+import openai
+import tiktoken
+from openai import AsyncOpenAI, OpenAI
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+try:  # optional: faster JSON encode/decode for --format=jsonl files
+    import orjson
+except ImportError:
+    orjson = None
 
 prompt = (
     "The following is a list of current Stanford CS PhDs; find where they attended "
@@ -12,8 +31,113 @@ prompt = (
 )
 
 
-def call_model(input: str, reasoning_effort: Optional[str] = None) -> str:
-    client = OpenAI()
+CACHE_PATH = Path(".gpt5_cache.sqlite")
+
+
+class ResponseCache:
+    """Disk cache of model outputs keyed by (input, reasoning_effort, model).
+
+    Survives across processes, so reruns and merges never re-send a prompt
+    the model has already answered.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH) -> None:
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, output TEXT)"
+        )
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT output FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, output: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, output) VALUES (?, ?)",
+            (key, output),
+        )
+        self.conn.commit()
+
+
+def cache_key(input: str, reasoning_effort: Optional[str]) -> str:
+    raw = "\x00".join([input, reasoning_effort or "", "gpt-5"])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def clear_cache(path: Path = CACHE_PATH) -> None:
+    if path.exists():
+        path.unlink()
+        print(f"Cleared response cache at {path}")
+
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.encoding_for_model("gpt-5")
+    return len(_encoding.encode(text))
+
+
+class RateLimiter:
+    """Client-side token bucket for requests-per-minute and tokens-per-minute.
+
+    Capacity refills linearly with elapsed time, so callers sleep locally
+    instead of slamming into server-side 429 backoff.
+    """
+
+    def __init__(self, max_rpm: Optional[float], max_tpm: Optional[float]) -> None:
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self.available_request_capacity = float(max_rpm) if max_rpm else 0.0
+        self.available_token_capacity = float(max_tpm) if max_tpm else 0.0
+        self.last_update = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        if self.max_rpm:
+            self.available_request_capacity = min(
+                self.max_rpm,
+                self.available_request_capacity + elapsed * self.max_rpm / 60,
+            )
+        if self.max_tpm:
+            self.available_token_capacity = min(
+                self.max_tpm,
+                self.available_token_capacity + elapsed * self.max_tpm / 60,
+            )
+        self.last_update = now
+
+    async def acquire(self, n_tokens: int) -> None:
+        # a prompt estimated above max_tpm could never be satisfied in full
+        # and would spin here forever; clamp so it instead drains (at most)
+        # one whole minute's budget
+        if self.max_tpm and n_tokens > self.max_tpm:
+            print(
+                f"Prompt estimate of {n_tokens} tokens exceeds --max-tpm "
+                f"{self.max_tpm}; throttling it as a full minute's budget"
+            )
+            n_tokens = self.max_tpm
+        while True:
+            self._refill()
+            if self.max_rpm and self.available_request_capacity < 1:
+                pass
+            elif self.max_tpm and self.available_token_capacity < n_tokens:
+                pass
+            else:
+                if self.max_rpm:
+                    self.available_request_capacity -= 1
+                if self.max_tpm:
+                    self.available_token_capacity -= n_tokens
+                return
+            await asyncio.sleep(0.5)
+
+
+def build_request(input: str, reasoning_effort: Optional[str] = None) -> Dict:
     request = {
         "model": "gpt-5",
         "tools": [
@@ -24,78 +148,404 @@ def call_model(input: str, reasoning_effort: Optional[str] = None) -> str:
     }
     if reasoning_effort:
         request["reasoning"] = {"effort": reasoning_effort}
+    return request
+
 
-    response = client.responses.create(**request)
+@retry(
+    retry=retry_if_exception_type(
+        (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)
+    ),
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(5),
+)
+async def call_model(
+    client: AsyncOpenAI,
+    input: str,
+    reasoning_effort: Optional[str] = None,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
+) -> str:
+    if cache is not None:
+        key = cache_key(input, reasoning_effort)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    if limiter is not None:
+        await limiter.acquire(estimate_tokens(input))
+    request = build_request(input, reasoning_effort=reasoning_effort)
+    response = await client.responses.create(**request)
+    if cache is not None:
+        cache.put(key, response.output_text)
     return response.output_text
 
 
-def chunked(items: List[str], chunk_size: int) -> Iterable[List[str]]:
-    for start in range(0, len(items), chunk_size):
-        yield items[start : start + chunk_size]
+def chunked(items: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    it = iter(items)
+    while batch := list(itertools.islice(it, chunk_size)):
+        yield batch
+
+
+def iter_names(path: Path) -> Iterator[str]:
+    """Yield non-empty stripped lines without loading the whole file."""
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped:
+                yield stripped
 
 
-def get_undergrad_schools(
-    people_list: List[str], reasoning_effort: Optional[str] = None
+async def get_undergrad_schools(
+    client: AsyncOpenAI,
+    people_list: List[str],
+    reasoning_effort: Optional[str] = None,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> str:
     input_text = prompt + "\n".join(people_list)
-    return call_model(input_text, reasoning_effort=reasoning_effort)
+    return await call_model(
+        client,
+        input_text,
+        reasoning_effort=reasoning_effort,
+        limiter=limiter,
+        cache=cache,
+    )
 
 
-def process_names(
+def _chunk_hash(chunk: List[str]) -> str:
+    return hashlib.sha1("\n".join(chunk).encode()).hexdigest()
+
+
+def _load_checkpoint(ckpt_path: Path) -> Dict[str, str]:
+    """Map names_hash -> output for every chunk a previous run completed."""
+    done: Dict[str, str] = {}
+    if ckpt_path.exists():
+        for line in ckpt_path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                record = json.loads(line)
+                done[record["names_hash"]] = record["output"]
+    return done
+
+
+async def _process_chunk(
+    client: AsyncOpenAI,
+    sem: asyncio.Semaphore,
+    idx: int,
+    total_chunks: int,
+    chunk: List[str],
+    reasoning_effort: Optional[str],
+    limiter: Optional[RateLimiter],
+    cache: Optional[ResponseCache],
+    ckpt_file,
+) -> str:
+    async with sem:
+        print(f"Processing chunk {idx}/{total_chunks} with {len(chunk)} names…")
+        result = await get_undergrad_schools(
+            client,
+            chunk,
+            reasoning_effort=reasoning_effort,
+            limiter=limiter,
+            cache=cache,
+        )
+    # Checkpoint as soon as the chunk completes so an interrupted run can
+    # resume without re-spending tokens on finished chunks.
+    record = {"chunk_idx": idx - 1, "names_hash": _chunk_hash(chunk), "output": result}
+    ckpt_file.write(json.dumps(record) + "\n")
+    ckpt_file.flush()
+    return result
+
+
+async def _process_names_async(
     names: List[str],
     output_path: Path,
+    chunk_size: int,
+    reasoning_effort: Optional[str],
+    concurrency: int,
+    max_rpm: Optional[float],
+    max_tpm: Optional[float],
+    use_cache: bool,
+    output_format: str,
+) -> None:
+    client = AsyncOpenAI()
+    sem = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(max_rpm, max_tpm) if (max_rpm or max_tpm) else None
+    cache = ResponseCache() if use_cache else None
+    chunks = list(chunked(names, chunk_size))
+    if not chunks:
+        raise ValueError("No names supplied to process")
+
+    ckpt_path = output_path.with_suffix(".ckpt.jsonl")
+    done = _load_checkpoint(ckpt_path)
+
+    results: List[object] = [None] * len(chunks)
+    pending = []
+    for idx, chunk in enumerate(chunks):
+        cached = done.get(_chunk_hash(chunk))
+        if cached is not None:
+            results[idx] = cached
+        else:
+            pending.append(idx)
+    if len(pending) < len(chunks):
+        print(f"Resuming: {len(chunks) - len(pending)}/{len(chunks)} chunks already checkpointed")
+
+    with ckpt_path.open("a", encoding="utf-8") as ckpt_file:
+        tasks = [
+            _process_chunk(
+                client,
+                sem,
+                idx + 1,
+                len(chunks),
+                chunks[idx],
+                reasoning_effort,
+                limiter,
+                cache,
+                ckpt_file,
+            )
+            for idx in pending
+        ]
+        gathered = await asyncio.gather(*tasks, return_exceptions=True)
+    for idx, result in zip(pending, gathered):
+        results[idx] = result
+
+    # Results are in input order, so the output file stays aligned with the
+    # name list even though the requests ran concurrently. Durability comes
+    # from the per-chunk checkpoint, so one buffered write at the end is
+    # enough — no per-chunk write/flush syscalls.
+    parts: List[str] = []
+    for idx, result in enumerate(results, start=1):
+        if isinstance(result, BaseException):
+            print(f"Chunk {idx} failed after retries: {result}")
+            # Leave a marker so the failed chunk is easy to find and rerun.
+            parts.append(f"ERROR: chunk {idx}")
+            continue
+        result = result.strip()
+        if result:
+            parts.append(result)
+    _write_output(output_path, parts, output_format)
+
+
+def write_jsonl(path: Path, entries: Iterable[Tuple[str, str]]) -> None:
+    """Write (name, school) entries as JSONL, one object per line."""
+    with path.open("wb") as f:
+        for name, school in entries:
+            record = {"name": name, "school": school}
+            if orjson is not None:
+                f.write(orjson.dumps(record) + b"\n")
+            else:
+                f.write(json.dumps(record, ensure_ascii=False).encode() + b"\n")
+
+
+def read_jsonl(path: Path) -> Iterator[Tuple[str, str]]:
+    """Stream (name, school) entries from a JSONL processed file."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with path.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = loads(line)
+            yield record.get("name", ""), record.get("school", "")
+
+
+def _write_output(output_path: Path, parts: List[str], output_format: str) -> None:
+    """Save chunk outputs as pipe-separated text or as JSONL entries.
+
+    JSONL drops lines without a '|' (including failed-chunk markers); failed
+    chunks are never checkpointed, so a rerun picks them up regardless.
+    """
+    if output_format == "jsonl":
+        entries = []
+        for part in parts:
+            for line in part.splitlines():
+                if "|" not in line:
+                    continue
+                name, _, school = line.partition("|")
+                if name.strip():
+                    entries.append((name.strip(), school.strip()))
+        write_jsonl(output_path, entries)
+        return
+    output_path.write_text("\n\n".join(parts) + "\n", encoding="utf-8")
+
+
+def build_batch_jsonl(
+    names: List[str],
+    jsonl_path: Path,
     chunk_size: int = 10,
     reasoning_effort: Optional[str] = None,
+) -> Path:
+    with jsonl_path.open("w", encoding="utf-8") as f:
+        for idx, chunk in enumerate(chunked(names, chunk_size)):
+            input_text = prompt + "\n".join(chunk)
+            line = {
+                "custom_id": f"chunk-{idx}",
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": build_request(input_text, reasoning_effort=reasoning_effort),
+            }
+            f.write(json.dumps(line) + "\n")
+    return jsonl_path
+
+
+def submit_batch(jsonl_path: Path) -> str:
+    client = OpenAI()
+    with jsonl_path.open("rb") as f:
+        batch_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id}")
+    return batch.id
+
+
+def poll_batch(batch_id: str, interval: int = 30):
+    client = OpenAI()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in ("completed", "failed", "expired", "cancelled"):
+            return batch
+        print(f"Batch {batch_id} is {batch.status}…")
+        time.sleep(interval)
+
+
+def _response_output_text(body: Dict) -> str:
+    """Reassemble output_text from a raw /v1/responses body in a batch result."""
+    parts = []
+    for item in body.get("output", []):
+        if item.get("type") != "message":
+            continue
+        for content in item.get("content", []):
+            if content.get("type") == "output_text":
+                parts.append(content.get("text", ""))
+    return "".join(parts)
+
+
+def collect_batch(batch) -> List[str]:
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} finished with status {batch.status}")
+    client = OpenAI()
+    content = client.files.content(batch.output_file_id).text
+
+    outputs: Dict[int, str] = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        idx = int(record["custom_id"].split("-", 1)[1])
+        if record.get("error"):
+            print(f"Chunk {idx + 1} failed: {record['error']}")
+            continue
+        outputs[idx] = _response_output_text(record["response"]["body"])
+    return [outputs[idx] for idx in sorted(outputs)]
+
+
+def _process_names_batch(
+    names: Iterable[str],
+    output_path: Path,
+    chunk_size: int,
+    reasoning_effort: Optional[str],
+    output_format: str,
 ) -> None:
+    names = list(names)
     if not names:
         raise ValueError("No names supplied to process")
+    jsonl_path = build_batch_jsonl(
+        names,
+        output_path.with_suffix(".batch_requests.jsonl"),
+        chunk_size=chunk_size,
+        reasoning_effort=reasoning_effort,
+    )
+    batch_id = submit_batch(jsonl_path)
+    batch = poll_batch(batch_id)
+    results = collect_batch(batch)
+    _write_output(
+        output_path, [r.strip() for r in results if r.strip()], output_format
+    )
 
-    total_chunks = (len(names) + chunk_size - 1) // chunk_size
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with output_path.open("w", encoding="utf-8") as f:
-        for idx, chunk in enumerate(chunked(names, chunk_size), start=1):
-            print(f"Processing chunk {idx}/{total_chunks} with {len(chunk)} names…")
-            result = get_undergrad_schools(
-                chunk, reasoning_effort=reasoning_effort
-            ).strip()
-            if result:
-                f.write(result + "\n\n")
-                f.flush()
+def process_names(
+    names: Iterable[str],
+    output_path: Path,
+    chunk_size: int = 10,
+    reasoning_effort: Optional[str] = None,
+    concurrency: int = 8,
+    batch: bool = False,
+    max_rpm: Optional[float] = None,
+    max_tpm: Optional[float] = None,
+    use_cache: bool = True,
+    output_format: str = "text",
+) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if batch:
+        _process_names_batch(
+            names, output_path, chunk_size, reasoning_effort, output_format
+        )
+    else:
+        asyncio.run(
+            _process_names_async(
+                names,
+                output_path,
+                chunk_size,
+                reasoning_effort,
+                concurrency,
+                max_rpm,
+                max_tpm,
+                use_cache,
+                output_format,
+            )
+        )
     print(f"Saved results to {output_path}")
 
 
-def process_file(input_path: Path, output_path: Path, chunk_size: int = 10) -> None:
-    names = [
-        line.strip() for line in input_path.read_text().splitlines() if line.strip()
-    ]
-    process_names(names, output_path, chunk_size=chunk_size)
+def process_file(
+    input_path: Path,
+    output_path: Path,
+    chunk_size: int = 10,
+    concurrency: int = 8,
+    batch: bool = False,
+    max_rpm: Optional[float] = None,
+    max_tpm: Optional[float] = None,
+    use_cache: bool = True,
+    output_format: str = "text",
+) -> None:
+    process_names(
+        iter_names(input_path),
+        output_path,
+        chunk_size=chunk_size,
+        concurrency=concurrency,
+        batch=batch,
+        max_rpm=max_rpm,
+        max_tpm=max_tpm,
+        use_cache=use_cache,
+        output_format=output_format,
+    )
 
 
 def extract_unknown_names(processed_path: Path) -> List[str]:
-    names = []
-    for line in processed_path.read_text().splitlines():
-        if "|" not in line:
-            continue
-        name, school = [part.strip() for part in line.split("|", 1)]
-        if name and school.lower() == "unknown":
-            names.append(name)
-    return names
+    return [
+        name
+        for name, school in parse_processed_file(processed_path)
+        if school.lower() == "unknown"
+    ]
 
 
 def parse_processed_file(path: Path) -> List[Tuple[str, str]]:
-    """Parse a processed file into (name, school) tuples, skipping bad lines."""
+    """Parse a processed file (text or JSONL) into (name, school) tuples."""
+    if path.suffix == ".jsonl":
+        return [(name, school) for name, school in read_jsonl(path) if name]
     entries: List[Tuple[str, str]] = []
     for line in path.read_text().splitlines():
-        if "|" not in line:
+        name, sep, school = line.partition("|")
+        if not sep:
             continue
-        name, school = [part.strip() for part in line.split("|", 1)]
+        name = name.strip()
         if name:
-            entries.append((name, school))
+            entries.append((name, school.strip()))
     return entries
 
 
-def merge_processed_files(base_path: Path, update_paths: List[Path]) -> List[str]:
+def merge_processed_files(
+    base_path: Path, update_paths: List[Path]
+) -> List[Tuple[str, str]]:
     base_entries = parse_processed_file(base_path)
 
     # Latest non-unknown entry for each name wins.
@@ -105,12 +555,12 @@ def merge_processed_files(base_path: Path, update_paths: List[Path]) -> List[str
             if school and school.lower() != "unknown":
                 updates[name] = school
 
-    merged_lines: List[str] = []
+    merged: List[Tuple[str, str]] = []
     for name, school in base_entries:
         if (not school) or school.lower() == "unknown":
             school = updates.get(name, school)
-        merged_lines.append(f"{name} | {school if school else 'unknown'}")
-    return merged_lines
+        merged.append((name, school if school else "unknown"))
+    return merged
 
 
 def main() -> None:
@@ -152,17 +602,78 @@ def main() -> None:
         choices=["low", "medium", "high"],
         help="Reasoning effort to request (default: model default; unknown retries default to high)",
     )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=8,
+        help="How many model calls to keep in flight at once",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all chunks through the Batch API (cheaper, up to 24h turnaround)",
+    )
+    parser.add_argument(
+        "--max-rpm",
+        type=float,
+        help="Throttle to at most this many requests per minute (default: no throttle)",
+    )
+    parser.add_argument(
+        "--max-tpm",
+        type=float,
+        help="Throttle to at most this many input tokens per minute (default: no throttle)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the on-disk response cache and always call the model",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Delete the on-disk response cache before running",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "jsonl"],
+        default=None,
+        help="Output format: pipe-separated text or JSONL (default: match the input file)",
+    )
     args = parser.parse_args()
 
+    if args.clear_cache:
+        clear_cache()
+
+    # parse_processed_file tells the formats apart by suffix, so the output
+    # suffix must agree with the format actually written: default the format
+    # to whatever the input suffix implies, and never leave a .jsonl name on
+    # a text file
+    out_format = args.format or (
+        "jsonl" if args.input_file.suffix == ".jsonl" else "text"
+    )
+    if out_format == "jsonl":
+        out_suffix = ".jsonl"
+    elif args.input_file.suffix == ".jsonl":
+        out_suffix = ".txt"
+    else:
+        out_suffix = args.input_file.suffix
+
     if args.merge_with:
         if args.retry_unknowns:
             raise ValueError("Use either --merge-with or --retry-unknowns, not both")
         output_path = args.output or args.input_file.with_name(
-            f"{args.input_file.stem}_merged{args.input_file.suffix}"
+            f"{args.input_file.stem}_merged{out_suffix}"
         )
         merged = merge_processed_files(args.input_file, args.merge_with)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("\n".join(merged) + "\n", encoding="utf-8")
+        if out_format == "jsonl":
+            write_jsonl(output_path, merged)
+        else:
+            output_path.write_text(
+                "\n".join(f"{name} | {school}" for name, school in merged) + "\n",
+                encoding="utf-8",
+            )
         print(f"Saved merged file to {output_path}")
     elif args.retry_unknowns:
         names = extract_unknown_names(args.input_file)
@@ -171,7 +682,7 @@ def main() -> None:
                 "No names marked as unknown were found in the provided file"
             )
         output_path = args.output or args.input_file.with_name(
-            f"{args.input_file.stem}_unknown_retry{args.input_file.suffix}"
+            f"{args.input_file.stem}_unknown_retry{out_suffix}"
         )
         reasoning_effort = args.reasoning_effort or "high"
         process_names(
@@ -179,12 +690,28 @@ def main() -> None:
             output_path,
             chunk_size=args.chunk_size,
             reasoning_effort=reasoning_effort,
+            concurrency=args.concurrency,
+            batch=args.batch,
+            max_rpm=args.max_rpm,
+            max_tpm=args.max_tpm,
+            use_cache=not args.no_cache,
+            output_format=out_format,
         )
     else:
         output_path = args.output or args.input_file.with_name(
-            f"{args.input_file.stem}_processed{args.input_file.suffix}"
+            f"{args.input_file.stem}_processed{out_suffix}"
+        )
+        process_file(
+            args.input_file,
+            output_path,
+            chunk_size=args.chunk_size,
+            concurrency=args.concurrency,
+            batch=args.batch,
+            max_rpm=args.max_rpm,
+            max_tpm=args.max_tpm,
+            use_cache=not args.no_cache,
+            output_format=out_format,
         )
-        process_file(args.input_file, output_path, chunk_size=args.chunk_size)
 
 
 if __name__ == "__main__":
@@ -25,10 +25,24 @@ from __future__ import annotations
 
 import re
 import sys
+from pathlib import Path
 from typing import List, Optional
 
 import pandas as pd
 
+# repo root, for the shared canonicalisation machinery
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from canonicalizer import (
+    RE_PAREN_BAL as _PAREN,
+    RE_PAREN_UNBAL as _UNMATCHED_PAREN,
+    RE_SPLIT_FIRST as _SPLIT_FIRST,
+    RE_TRAIL_CITY as _TRAIL,
+    RE_WS as _WS,
+    make_alias_expander,
+)
+from school_names import TOP_SCHOOLS
+
 ##############################################################################
 # 0.  OPTIONAL: LIMIT WHICH DEPARTMENT CODES ARE RECOGNISED ------------------
 ##############################################################################
@@ -56,39 +70,7 @@ if not raw_lines:
     sys.exit("❌ Clipboard appears to be empty.")
 
 ##############################################################################
-# 2.  PARSE LINES INTO STUDENT RECORDS --------------------------------------
-##############################################################################
-records: List[dict[str, str]] = []
-current_dept: str | None = None
-
-for line in raw_lines:
-    if "|" not in line:  # potential department heading
-        dept_candidate = line.strip()
-        if ALLOWED_DEPTS is None or dept_candidate in ALLOWED_DEPTS:
-            current_dept = dept_candidate
-        # else ignore stray headings (e.g. RI) that aren't of interest
-        continue
-
-    if current_dept is None:
-        continue  # ignore lines before first recognised department
-
-    name, inst = (seg.strip() for seg in line.split("|", 1))
-    if not name or not inst:
-        continue  # malformed – skip
-
-    records.append(
-        {
-            "Name": name,
-            "Undergraduate Institution": inst,
-            "Dept": current_dept,
-        }
-    )
-
-if not records:
-    sys.exit("❌ No student lines detected – check the clipboard format/dept names.")
-
-##############################################################################
-# 3.  CANONICALISE SCHOOL NAMES ---------------------------------------------
+# 2.  CANONICALISATION MACHINERY --------------------------------------------
 ##############################################################################
 ALIASES = {
     # ── common US shortcuts ─────────────────────────────────────────
@@ -120,62 +102,105 @@ MISSING_PAT = re.compile(
     re.I,
 )
 
+_expand_aliases = make_alias_expander(ALIASES)
+
+# already-canonical names: a hit here skips all regex work for the row
+_CANON_SET = TOP_SCHOOLS | frozenset(ALIASES.values())
 
-def canonical(inst: str | pd.NA) -> str | pd.NA:
-    """Return a cleaned‑up institution name or <NA> if missing/unknown."""
-    if pd.isna(inst):
-        return pd.NA
 
-    inst = str(inst).strip()
+def canonical(inst: str) -> str | None:
+    """Clean up one institution string; None if missing/unknown."""
+    inst = inst.strip()
+    if inst in _CANON_SET:  # already canonical → skip all regex work
+        return inst
     # normalise Unicode dashes to ASCII hyphen
     inst = inst.replace("–", "-").replace("—", "-")
 
-    # placeholders or dashed rows → NA
-    if not inst or re.fullmatch(r"-+", inst) or MISSING_PAT.fullmatch(inst):
-        return pd.NA
+    # placeholders or dashed rows → drop ("all hyphens" is a single C-level
+    # strip, no regex engine needed)
+    if not inst or not inst.strip("-") or MISSING_PAT.fullmatch(inst):
+        return None
 
     # keep only the first institution if multiple are separated by ';' or '&'
-    inst = re.split(r"[;&]", inst)[0].strip()
+    inst = _SPLIT_FIRST.split(inst, maxsplit=1)[0].strip()
+
+    # expand common abbreviations / aliases (automaton for literal tokens)
+    inst = _expand_aliases(inst)
+
+    # remove balanced (…) and dangling “( …”, collapse whitespace
+    inst = _PAREN.sub(" ", inst)
+    inst = _UNMATCHED_PAREN.sub("", inst)
+    inst = _WS.sub(" ", inst).strip()
+
+    # trim trailing “, Country / City / Campus” except UC & U‑Maryland;
+    # the '","' precheck keeps the regex engine out of the comma-free majority
+    if "," in inst and not inst.startswith(
+        ("University of California,", "University of Maryland,")
+    ):
+        inst = _TRAIL.sub("", inst).strip()
+
+    return inst or None
 
-    # expand common abbreviations / aliases
-    for pat, repl in ALIASES.items():
-        if re.search(pat, inst, flags=re.I):
-            inst = re.sub(pat, repl, inst, flags=re.I)
-            break
 
-    # remove balanced (…) and dangling “( …”
-    inst = re.sub(r"\([^)]*\)", " ", inst)  # balanced parentheses
-    inst = re.sub(r"\s*\(.*$", "", inst)  # unmatched opening “(”
-    inst = re.sub(r"\s+", " ", inst).strip()  # collapse whitespace
+##############################################################################
+# 3.  PARSE + CANONICALISE IN A SINGLE PASS ---------------------------------
+##############################################################################
+rows: List[tuple[str, str, str]] = []
+initial_rows = 0
+current_dept: str | None = None
+
+for line in raw_lines:
+    name, sep, inst = line.partition("|")
+    if not sep:  # no delimiter → potential department heading
+        dept_candidate = line.strip()
+        if ALLOWED_DEPTS is None or dept_candidate in ALLOWED_DEPTS:
+            current_dept = dept_candidate
+        # else ignore stray headings (e.g. RI) that aren't of interest
+        continue
 
-    # trim trailing “, Country / City / Campus” except UC & U‑Maryland
-    if not inst.startswith(("University of California,", "University of Maryland,")):
-        inst = re.sub(r",\s*[A-Z][A-Za-z.\s]+$", "", inst).strip()
+    if current_dept is None:
+        continue  # ignore lines before first recognised department
 
-    return inst or pd.NA
+    name = name.strip()
+    if not name or not inst.strip():
+        continue  # malformed – skip
 
+    initial_rows += 1
+    inst_canon = canonical(inst)
+    if inst_canon is not None:  # unresolved institutions never enter pandas
+        rows.append((name, inst_canon, current_dept))
 
-df = pd.DataFrame.from_records(records)
-df["Inst_canon"] = df["Undergraduate Institution"].apply(canonical)
+if initial_rows == 0:
+    sys.exit("❌ No student lines detected – check the clipboard format/dept names.")
 
-# Drop rows where the institution could not be resolved
-initial_rows, final_rows = len(df), df["Inst_canon"].notna().sum()
-df = df.dropna(subset=["Inst_canon"]).reset_index(drop=True)
+df = pd.DataFrame(rows, columns=["Name", "Inst_canon", "Dept"])
+final_rows = len(df)
 
 ##############################################################################
 # 4.  AGGREGATE COUNTS -------------------------------------------------------
 ##############################################################################
+# low-cardinality columns → categorical, so grouping runs on integer codes
+df["Inst_canon"] = pd.Categorical(df["Inst_canon"])
+df["Dept"] = pd.Categorical(df["Dept"])
+
+# value_counts counts in one pass; sort=False so the single sort below
+# also applies the alphabetical tie-break
 per_dept = (
-    df.groupby(["Dept", "Inst_canon"], as_index=False)
-    .size()
-    .rename(columns={"size": "Student Count"})
-    .sort_values(["Dept", "Student Count", "Inst_canon"], ascending=[True, False, True])
+    df.groupby("Dept", observed=True)["Inst_canon"]
+    .value_counts(sort=False)
+    .rename("Student Count")
+    .reset_index()
+)
+# categorical value_counts reports every category per dept; drop the zeros
+per_dept = per_dept[per_dept["Student Count"] > 0].sort_values(
+    ["Dept", "Student Count", "Inst_canon"], ascending=[True, False, True]
 )
 
 overall = (
-    df.groupby("Inst_canon", as_index=False)
-    .size()
-    .rename(columns={"size": "Student Count"})
+    df["Inst_canon"]
+    .value_counts(sort=False)
+    .rename_axis("Inst_canon")
+    .reset_index(name="Student Count")
     .sort_values(["Student Count", "Inst_canon"], ascending=[False, True])
 )
 
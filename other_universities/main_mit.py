@@ -22,12 +22,35 @@ schools, and collapses obvious abbreviations.
 
 from __future__ import annotations
 
+import io
 import re
 import sys
+from collections import Counter
+from pathlib import Path
 from typing import List
 
 import pandas as pd
 
+try:  # optional: C++/SIMD CSV parse instead of the Python split loop
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pragma: no cover
+    pacsv = None
+
+# repo root, for the shared canonicalisation machinery
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from canonicalizer import (
+    RE_DASHED as _DASHED,
+    RE_PAREN_BAL as _PAREN,
+    RE_PAREN_UNBAL as _UNMATCHED_PAREN,
+    RE_SPLIT_FIRST as _SPLIT_FIRST,
+    RE_TRAIL_CITY as _TRAIL,
+    RE_WS as _WS,
+    make_alias_expander,
+)
+from school_names import TOP_SCHOOLS
+
 # ──────────────────────────────────────────────────────────────────────
 # 1. READ RAW TEXT FROM THE CLIPBOARD
 # ──────────────────────────────────────────────────────────────────────
@@ -51,19 +74,34 @@ if not raw_lines:
 # ──────────────────────────────────────────────────────────────────────
 # 2. PARSE LINES → STUDENT RECORDS (no departments)
 # ──────────────────────────────────────────────────────────────────────
-records: List[dict[str, str]] = []
-for line in raw_lines:
-    if "|" not in line:
-        continue  # ignore non-data lines
-
-    name, inst = (seg.strip() for seg in line.split("|", 1))
-    if not name or not inst:
-        continue  # malformed entry
-
-    records.append({"Name": name, "Undergraduate Institution": inst})
-
-if not records:
-    sys.exit("❌ No valid student rows detected – check the clipboard format.")
+_COLUMNS = ["Name", "Undergraduate Institution"]
+
+
+def _parse_rows(lines: List[str]) -> pd.DataFrame:
+    data_lines = [ln for ln in lines if "|" in ln]
+    if pacsv is not None:
+        # pyarrow would treat extra pipes as extra columns, so only the
+        # single-delimiter majority goes through it; the rest fall back to
+        # the split-once path
+        simple = [ln for ln in data_lines if ln.count("|") == 1]
+        extra = [tuple(ln.split("|", 1)) for ln in data_lines if ln.count("|") > 1]
+        table = pacsv.read_csv(
+            io.BytesIO("\n".join(simple).encode()),
+            read_options=pacsv.ReadOptions(column_names=_COLUMNS),
+            parse_options=pacsv.ParseOptions(delimiter="|", quote_char=False),
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.string() for col in _COLUMNS}
+            ),
+        )
+        df = table.to_pandas()
+        if extra:
+            df = pd.concat(
+                [df, pd.DataFrame(extra, columns=_COLUMNS)], ignore_index=True
+            )
+        return df
+    return pd.DataFrame(
+        [tuple(ln.split("|", 1)) for ln in data_lines], columns=_COLUMNS
+    )
 
 # ──────────────────────────────────────────────────────────────────────
 # 3. CANONICALISE SCHOOL NAMES
@@ -93,55 +131,83 @@ ALIASES = {
     r"\bHarvard College\b": "Harvard University",
 }
 
-MISSING_PAT = re.compile(r"(not\s*(found|available)|^n/?a$)", re.I)
+MISSING_PAT = re.compile(r"(?:not\s*(?:found|available)|^n/?a$)", re.I)
 
+_expand_aliases = make_alias_expander(ALIASES)
 
-def canonical(inst: str | pd.NA) -> str | pd.NA:
-    """Return a cleaned-up school name, or <NA> if missing."""
-    if pd.isna(inst):
-        return pd.NA
+# already-canonical names: a hit here skips all regex work for the row
+_CANON_SET = TOP_SCHOOLS | frozenset(ALIASES.values())
 
-    inst = str(inst).strip()
-    if not inst or re.fullmatch(r"-+", inst) or MISSING_PAT.search(inst):
-        return pd.NA
 
-    # keep only the first institution if multiple separated by ';' or '&'
-    inst = re.split(r"[;&]", inst)[0].strip()
+def canonicalise_series(s: pd.Series) -> pd.Series:
+    """Vectorised clean-up of a school-name column (NA where missing).
 
-    # apply alias expansions
-    for pat, repl in ALIASES.items():
-        if re.search(pat, inst, flags=re.I):
-            inst = re.sub(pat, repl, inst, flags=re.I)
-            break
+    Rows already holding a known canonical name are passed through
+    untouched; only the rest go through the regex pipeline.
+    """
+    s = s.astype("string").str.strip()
+    known = s.isin(_CANON_SET).fillna(False)
+    if known.all():
+        return s
+    s = s.copy()
+    s[~known] = _canonicalise_slow(s[~known])
+    return s
 
-    # strip parenthetical notes
-    inst = re.sub(r"\([^)]*\)", " ", inst)  # balanced (…)
-    inst = re.sub(r"\s*\(.*$", "", inst)  # unmatched opening '('
-    inst = re.sub(r"\s+", " ", inst).strip()  # collapse whitespace
 
-    # ── SPECIAL RULE: preserve IIT campus suffixes ──────────────────
-    if inst.startswith("Indian Institute of Technology"):
-        return inst
+def _canonicalise_slow(s: pd.Series) -> pd.Series:
+    """Full clean-up pipeline; same rules as the old per-row canonical()."""
+    s = s.mask(
+        (s == "") | s.str.fullmatch(_DASHED, na=False) | s.str.contains(MISSING_PAT, na=False)
+    )
 
-    # strip trailing “, City/Country” (except UC & U-Maryland prefixes)
-    if not inst.startswith(("University of California,", "University of Maryland,")):
-        inst = re.sub(r",\s*[A-Z][A-Za-z.\s]+$", "", inst).strip()
-
-    return inst or pd.NA
-
-
-df = pd.DataFrame.from_records(records)
-df["Inst_canon"] = df["Undergraduate Institution"].apply(canonical)
+    # keep only the first institution if multiple separated by ';' or '&'
+    s = s.str.split(_SPLIT_FIRST, n=1, regex=True).str[0].str.strip()
+
+    # apply alias expansions (automaton for literal tokens, regex residue)
+    s = s.map(_expand_aliases, na_action="ignore")
+
+    # strip parenthetical notes, collapse whitespace
+    s = s.str.replace(_PAREN, " ", regex=True)  # balanced (…)
+    s = s.str.replace(_UNMATCHED_PAREN, "", regex=True)  # unmatched opening '('
+    s = s.str.replace(_WS, " ", regex=True).str.strip()
+
+    # strip trailing “, City/Country” — except IIT campus suffixes and the
+    # UC & U-Maryland prefixes, which keep their comma
+    protected = s.str.startswith(
+        (
+            "Indian Institute of Technology",
+            "University of California,",
+            "University of Maryland,",
+        ),
+        na=False,
+    )
+    trimmed = s.str.replace(_TRAIL, "", regex=True).str.strip()
+    s = s.where(protected, trimmed)
+
+    return s.mask(s == "")
+
+
+df = _parse_rows(raw_lines)
+# strip whitespace column-wide (C path) rather than per cell in the parse loop
+for col in _COLUMNS:
+    df[col] = df[col].str.strip()
+df = df[(df["Name"] != "") & (df["Undergraduate Institution"] != "")].reset_index(
+    drop=True
+)
+if df.empty:
+    sys.exit("❌ No valid student rows detected – check the clipboard format.")
+df["Inst_canon"] = canonicalise_series(df["Undergraduate Institution"])
 df = df.dropna(subset=["Inst_canon"]).reset_index(drop=True)
 
 # ──────────────────────────────────────────────────────────────────────
 # 4. AGGREGATE & DISPLAY
 # ──────────────────────────────────────────────────────────────────────
-overall = (
-    df.groupby("Inst_canon", as_index=False)
-    .size()
-    .rename(columns={"size": "Student Count"})
-    .sort_values("Student Count", ascending=False)
+# Counter accumulates straight over the object array — no pandas groupby
+# scaffolding; sort by (count desc, name asc) to keep ties deterministic
+cnt = Counter(df["Inst_canon"].to_numpy(dtype=object))
+overall = pd.DataFrame(
+    sorted(cnt.items(), key=lambda kv: (-kv[1], kv[0])),
+    columns=["Inst_canon", "Student Count"],
 )
 
 print("\n=== MIT OVERALL ===")
@@ -0,0 +1,246 @@
+"""Common canonical institution names, used as a fast-path skip set.
+
+Every entry must be a fixed point of the clean-up pipelines in
+main_mit.py and main_cmu.py (no aliases, parens, or trailing city
+segments to strip) — a hit means canonicalisation can return the
+string as-is. Drawn from the processed Stanford/MIT/CMU lists.
+"""
+
+TOP_SCHOOLS = frozenset(
+    {
+        'American University of Beirut',
+        'Arizona State University',
+        'BMS College of Engineering',
+        'Bangladesh University of Engineering and Technology',
+        'Beihang University',
+        'Beijing Normal University',
+        'Ben-Gurion University of the Negev',
+        'Bharati Vidyapeeth',
+        'Bilkent University',
+        'Birla Institute of Technology and Science',
+        'Bogazici University',
+        'Boston University',
+        'Bowdoin College',
+        'Boğaziçi University',
+        'Brandeis University',
+        'Brigham Young University',
+        'Brown University',
+        'Bursa Technical University',
+        'California Institute of Technology',
+        'California Polytechnic State University',
+        'Carleton College',
+        'Carnegie Mellon University',
+        'Case Western Reserve University',
+        'Central University of Finance and Economics',
+        'Chalmers University of Technology',
+        'Chinese University of Hong Kong',
+        'Claude Bernard University Lyon 1',
+        'Colby College',
+        'Columbia University',
+        'Copenhagen Business School',
+        'Cornell University',
+        'Dalian University of Technology',
+        'Dartmouth College',
+        'DePauw University',
+        'Delft University of Technology',
+        'Dickinson College',
+        'Duke University',
+        'Duquesne University',
+        'ETH Zürich',
+        'Ecole Polytechnique Federale de Lausanne',
+        "Ecole Superieure d'Ingenierie en Sciences Appliquees",
+        'Federal University of Agriculture Abeokuta',
+        'Federal University of Rio de Janeiro',
+        'Franklin W. Olin College of Engineering',
+        'Freie Universität Berlin',
+        'Fudan University',
+        'Georgetown University',
+        'Georgia Institute of Technology',
+        'Goethe University Frankfurt',
+        'Guru Gobind Singh Indraprastha University',
+        'Hanoi University of Science and Technology',
+        'Hanyang University',
+        'Harbin Institute of Technology',
+        'Harvard University',
+        'Harvey Mudd College',
+        'Haverford College',
+        'Hebrew University of Jerusalem',
+        'Hong Kong University of Science and Technology',
+        'Huazhong University of Science and Technology',
+        'IIEST Shibpur',
+        'Indian Institute of Technology Bombay',
+        'Indian Institute of Technology Delhi',
+        'Indian Institute of Technology Guwahati',
+        'Indian Institute of Technology Kanpur',
+        'Indian Institute of Technology Kharagpur',
+        'Indian Institute of Technology Madras',
+        'Indian Institute of Technology Patna',
+        'Indian Institute of Technology Roorkee',
+        'Indraprastha Institute of Information Technology Delhi',
+        'Instituto Superior Técnico',
+        'International Institute of Information Technology',
+        'International Institute of Information Technology Hyderabad',
+        'Jaypee Institute of Information Technology',
+        'Johns Hopkins University',
+        'KAIST',
+        'Keio University',
+        'Kobe University',
+        'Korea Advanced Institute of Science and Technology',
+        'Kwame Nkrumah University of Science and Technology',
+        'La Salle Campus Barcelona',
+        'Lahore University of Management Sciences',
+        'Macalester College',
+        'Marist College',
+        'Massachusetts Institute of Technology',
+        'McGill University',
+        'Middlebury College',
+        'Military Institute of Science and Technology',
+        'Moscow Institute of Physics and Technology',
+        'Nanjing University',
+        'Nankai University',
+        'Nanyang Technological University',
+        'Nara Women’s University',
+        'National Institute of Technology',
+        'National Taiwan University',
+        'National Technical University of Athens',
+        'National Tsing Hua University',
+        'National University of Singapore',
+        'Netaji Subhas Institute of Technology',
+        'Netaji Subhas University of Technology',
+        'New York University',
+        'Northeastern University',
+        'Northwestern University',
+        'Olin College of Engineering',
+        'PES Institute of Technology',
+        'PES University',
+        'Peking University',
+        'Pennsylvania State University',
+        'Pohang University of Science and Technology',
+        'Pomona College',
+        'Pontificia Universidad Católica de Chile',
+        'Poznan University of Technology',
+        'Princeton University',
+        'Purdue University',
+        "Queen's University",
+        'R V College of Engineering',
+        'Renmin University of China',
+        'Rensselaer Polytechnic Institute',
+        'Rice University',
+        'Rutgers University',
+        'San José State University',
+        'Seoul National University',
+        'Shahid Beheshti University',
+        'Shandong University',
+        'Shanghai Jiao Tong University',
+        'ShanghaiTech University',
+        'Sharif University of Technology',
+        'Simon Fraser University',
+        'Singapore Management University',
+        'Singapore University of Technology and Design',
+        'Sogang University',
+        'Soochow University',
+        'South China Agricultural University',
+        'Southwest Jiaotong University',
+        'Spelman College',
+        'Sri Jayachamarajendra College of Engineering',
+        'Stanford University',
+        'Stony Brook University',
+        'Sultan Qaboos University',
+        'Sun Yat-sen University',
+        'Swarthmore College',
+        'Technical University of Crete',
+        'Technical University of Darmstadt',
+        'Tecnológico de Monterrey',
+        'Tel Aviv University',
+        'The Hebrew University of Jerusalem',
+        'The Hong Kong Polytechnic University',
+        'The Hong Kong University of Science and Technology',
+        'Tianjin University',
+        'Tokyo Institute of Technology',
+        'Tongji University',
+        'Trinity College',
+        'Tsinghua University',
+        'Tufts University',
+        'Universidad de Los Andes',
+        'Universitas Indonesia',
+        'University College Dublin',
+        'University College London',
+        'University of Alabama at Birmingham',
+        'University of Arizona',
+        'University of Arkansas',
+        'University of Brasília',
+        'University of British Columbia',
+        'University of California, Berkeley',
+        'University of California, Davis',
+        'University of California, Irvine',
+        'University of California, Los Angeles',
+        'University of California, San Diego',
+        'University of California, Santa Barbara',
+        'University of California, Santa Cruz',
+        'University of Cambridge',
+        'University of Chicago',
+        'University of Chile',
+        'University of Chinese Academy of Sciences',
+        'University of Connecticut',
+        'University of Crete',
+        'University of Delaware',
+        'University of Edinburgh',
+        'University of Electronic Science and Technology of China',
+        'University of Hagen',
+        'University of Hong Kong',
+        'University of Illinois Urbana-Champaign',
+        'University of Ilorin',
+        'University of Iowa',
+        'University of Kansas',
+        'University of Liège',
+        'University of Manchester',
+        'University of Maryland',
+        'University of Maryland, Baltimore County',
+        'University of Maryland, College Park',
+        'University of Massachusetts Amherst',
+        'University of Michigan',
+        'University of Minnesota',
+        'University of North Carolina at Chapel Hill',
+        'University of Notre Dame',
+        'University of Oxford',
+        'University of Pennsylvania',
+        'University of Pittsburgh',
+        'University of Portland',
+        'University of Rochester',
+        'University of Science and Technology of China',
+        'University of South Florida',
+        'University of Southern California',
+        'University of Sydney',
+        'University of São Paulo',
+        'University of Tehran',
+        'University of Tennessee',
+        'University of Texas at Austin',
+        'University of Texas at Dallas',
+        'University of Thessaly',
+        'University of Tokyo',
+        'University of Toronto',
+        'University of Utah',
+        'University of Virginia',
+        'University of Washington',
+        'University of Waterloo',
+        'University of Wisconsin-Madison',
+        'VES Institute of Technology',
+        'Vanderbilt University',
+        'Vietnam National University - Ho Chi Minh City University of Science',
+        'Virginia Commonwealth University',
+        'Virginia Tech',
+        'Vrije Universiteit Brussel',
+        'Washington University in St. Louis',
+        'Wellesley College',
+        'Wenzhou-Kean University',
+        'Williams College',
+        'Worcester Polytechnic Institute',
+        'Wuhan University',
+        'Xiamen University',
+        'Xi’an Jiaotong University',
+        'Yale University',
+        'Yonsei University',
+        'Youngstown State University',
+        'Zhejiang University',
+    }
+)